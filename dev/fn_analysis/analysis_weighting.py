@@ -1,6 +1,5 @@
 import numpy as np
-from wsknn.weighting.weighting import linear_session_score, log_session_score, quadratic_session_score
-from wsknn.weighting.weighting import linear_item_score, inv_pos_item_score, log_item_score, quadratic_item_score
+from wsknn.weighting.vectorized import weight_item_score_vec, weight_session_items_vec
 
 import matplotlib.pyplot as plt
 
@@ -23,9 +22,9 @@ def analyse_weighting_output():
     for arr_tpl in arrs:
         length = arr_tpl[0]
         arr = arr_tpl[1]
-        lin_res = [linear_session_score(v, length) for v in arr]
-        log_res = [log_session_score(v, length) for v in arr]
-        quad_res = [quadratic_session_score(v, length) for v in arr]
+        lin_res = weight_session_items_vec('linear', arr, length)
+        log_res = weight_session_items_vec('log', arr, length)
+        quad_res = weight_session_items_vec('quadratic', arr, length)
 
         results[length] = (
             lin_res, log_res, quad_res
@@ -58,14 +57,12 @@ def analyse_ranking_output():
     for arr_tpl in arrs:
         length = arr_tpl[0]
         arr = arr_tpl[1]
-        lin_res = [linear_item_score(v) for v in arr]
-        inv_res = [inv_pos_item_score(v) for v in arr]
-        log_res = [log_item_score(v) for v in arr]
-        quad_res = [quadratic_item_score(v) for v in arr]
-
-        results[length] = (
-            lin_res, inv_res, log_res, quad_res
-        )
+        results[length] = np.stack([
+            weight_item_score_vec('linear', arr),
+            weight_item_score_vec('inv', arr),
+            weight_item_score_vec('log', arr),
+            weight_item_score_vec('quadratic', arr)
+        ])
 
     for fnl in results.keys():
         plt.figure(figsize=(12, 8))
@@ -52,31 +52,26 @@ def get_item_sessions_pairs(files: list) -> list:
 
     """
 
-    metas = list()
-    items = list()
-    sessions = list()
+    items = dict()
+    sessions = dict()
 
     for ffile in files:
-        fname = Path(ffile).stem
-        # Get ID
-        id_meta = fname[1+fname.find('_'):fname.rfind('.')]
-        if id_meta in metas:
-            pass
-        else:
-            metas.append(id_meta)
-            for _f in files:
-                items_prefix = 'items_' + id_meta
-                sessions_prefix = 'sessions_' + id_meta
-                if items_prefix in _f:
-                    items.append(_f)
-                elif sessions_prefix in _f:
-                    sessions.append(_f)
-            # Sanity check
-            if len(metas) != len(items) != len(sessions):
-                raise ValueError(f'Missing files, number of sessions: {len(sessions)}, '
-                                 f'number of items: {len(items)}')
-
-    output = list(zip(items, sessions, metas))
+        fname = Path(ffile).name.split('.', 1)[0]
+        # Get map type and ID
+        sep = fname.find('_')
+        map_type = fname[:sep]
+        id_meta = fname[1+sep:]
+        if map_type == 'items':
+            items[id_meta] = ffile
+        elif map_type == 'sessions':
+            sessions[id_meta] = ffile
+
+    # Sanity check
+    if items.keys() != sessions.keys():
+        raise ValueError(f'Missing files, number of sessions: {len(sessions)}, '
+                         f'number of items: {len(items)}')
+
+    output = [(items[id_meta], sessions[id_meta], id_meta) for id_meta in items]
     return output
 
 
@@ -165,12 +160,12 @@ def build_session_items_list(directory: str, file_type='') -> Iterator[dict]:
         yield outputd
 
 
-def test_model(model: VSKNN, settings: dict, number_of_repetitions=1000):
+def test_model(model: WSKNN, settings: dict, number_of_repetitions=1000):
     """Function tests model locally by random sampling of sessions
 
     Parameters
     ----------
-    model : VSKNN
+    model : WSKNN
             fitted model
 
     settings : dict
@@ -179,12 +174,11 @@ def test_model(model: VSKNN, settings: dict, number_of_repetitions=1000):
     number_of_repetitions : int
                             How many times prediction must be performed.
     """
-    kl = list(model.session_item_map.keys())
+    kl = tuple(model.session_item_map.keys())
+    samples = random.choices(kl, k=number_of_repetitions)
 
-    for _ in range(0, number_of_repetitions):
-        sample = random.randint(0, len(kl)-1)
-        test_session = model.session_item_map[kl[sample]]
-        test_session = {'a': test_session[0]}
+    for key in samples:
+        test_session = model.session_item_map[key]
         _ = predict(model, test_session)
 
 
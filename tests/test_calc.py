@@ -1,4 +1,6 @@
-from wsknn.utils.calc import is_there_any_common_element, weight_set_pair
+import numpy as np
+
+from wsknn.utils.calc import csr_rows_positions, is_there_any_common_element, weight_csc_rows, weight_set_pair
 
 
 def test_weight_set_pair():
@@ -30,3 +32,28 @@ def test_is_there_any_common_element():
 
     assert is_there_any_common_element(set_a, set_b) == expected_ab
     assert is_there_any_common_element(set_b, set_c) == expected_bc
+
+
+def test_csr_rows_positions():
+    indptr = np.array([0, 4, 5, 5, 10])
+    rows = np.array([3, 2, 0])
+
+    segments, positions = csr_rows_positions(rows, indptr)
+
+    assert segments.tolist() == [0, 0, 0, 0, 0, 2, 2, 2, 2]
+    assert positions.tolist() == [5, 6, 7, 8, 9, 0, 1, 2, 3]
+
+
+def test_weight_csc_rows():
+    # Rows: {1, 3, 5, 7}, {0}, {}, {0, 1, 3, 8, 9} stored by columns 0-9
+    indptr = np.array([0, 2, 4, 4, 6, 6, 7, 7, 8, 9, 10])
+    indices = np.array([1, 3, 0, 3, 0, 3, 0, 0, 3, 3])
+    rows = np.array([3, 0, 2, 1, 3])
+
+    codes = np.array([3, 1])
+    weights = np.array([12., 3.])
+
+    expected = np.array([15., 15., 0., 0., 15.])
+
+    assert np.array_equal(weight_csc_rows(rows, indptr, indices, codes, weights), expected)
+    assert np.array_equal(weight_csc_rows(rows, indptr, indices, codes[:0], weights[:0]), np.zeros(5))
@@ -1,4 +1,7 @@
-from wsknn.utils.transform import load_jsonl, load_gzipped_jsonl
+import gzip
+import pickle
+
+from wsknn.utils.transform import load_jsonl, load_gzipped_jsonl, load_pickled, load_gzipped_pickle
 
 
 EXPECTED_DICT = dict(id123=10.0002, id234=-90, id345="zzz")
@@ -14,3 +17,18 @@ def test_load_jsonl():
 def test_load_gzip():
     loaded_data = load_gzipped_jsonl(GZ_FILE)
     assert loaded_data == EXPECTED_DICT
+
+
+def test_load_pickles(tmp_path):
+    pkl_file = str(tmp_path / 'test.pkl')
+    gz_file = str(tmp_path / 'test.pkl.gz')
+
+    with open(pkl_file, 'wb') as fstream:
+        pickle.dump(EXPECTED_DICT, fstream)
+
+    with gzip.open(gz_file, 'wb') as fstream:
+        pickle.dump(EXPECTED_DICT, fstream)
+
+    for loader, fname in [(load_pickled, pkl_file), (load_gzipped_pickle, gz_file)]:
+        loaded_data = loader(fname)
+        assert loaded_data == EXPECTED_DICT
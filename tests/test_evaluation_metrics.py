@@ -1,4 +1,10 @@
-from wsknn.evaluate.scores.scores import mrr_func, recall_func, precision_func
+import pytest
+
+from wsknn.evaluate import metrics
+from wsknn.evaluate.metrics import score_model, get_precision
+from wsknn.evaluate.scores.scores import mrr_func, recall_func, precision_func, scores_func
+from wsknn.model.wsknn import WSKNN
+from wsknn.utils.errors import TooShortSessionException
 
 
 RELEVANT_ITEMS = list('abcdefgh')
@@ -25,3 +31,104 @@ def test_recall():
     score = recall_func(recommendations=RECOMMENDATIONS, relevant_items=RELEVANT_ITEMS_RECALL)
     # 0.5
     assert score == 0.5
+
+
+def test_scores():
+    rank, precision, recall = scores_func(recommendations=list('dxa'), relevant_items=RELEVANT_ITEMS_RECALL)
+
+    assert rank == 1 / 3
+    assert precision == precision_func(recommendations=list('dxa'), relevant_items=RELEVANT_ITEMS_RECALL)
+    assert recall == recall_func(recommendations=list('dxa'), relevant_items=RELEVANT_ITEMS_RECALL)
+    assert scores_func(recommendations=list('xyz'), relevant_items=RELEVANT_ITEMS) == (0, 0, 0)
+
+
+def test_scores_empty_recommendations():
+    assert precision_func(recommendations=[], relevant_items=RELEVANT_ITEMS) == 0
+    assert scores_func(recommendations=[], relevant_items=RELEVANT_ITEMS) == (0, 0, 0)
+
+
+# TEST MODEL SCORING
+
+def _get_model():
+    sessions = {
+        'a': [[1, 2, 3, 4, 5], [1, 2, 3, 4, 5]],
+        'b': [[2, 3, 4, 5], [10, 11, 12, 13]],
+        'c': [[5, 6, 1], [20, 21, 22]]
+    }
+
+    items = {
+        1: [['a', 'c'], [1]],
+        2: [['a', 'b'], [2]],
+        3: [['a', 'b'], [3]],
+        4: [['a', 'b'], [4]],
+        5: [['a', 'b', 'c'], [5]],
+        6: [['c'], [21]]
+    }
+
+    model = WSKNN(number_of_recommendations=2, return_events_from_session=False)
+    model.fit(sessions, items)
+    return model
+
+
+def test_score_model_n_jobs():
+    test_sessions = [
+        [[1, 2, 3, 4], [1, 2, 3, 4]],
+        [[5, 6, 1, 2, 3], [1, 2, 3, 4, 5]],
+        [[2, 5, 6], [1, 2, 3]],
+        [[4], [1]]
+    ]
+
+    model = _get_model()
+    scores = score_model(test_sessions, model, sliding_window=True)
+    scores_parallel = score_model(test_sessions, model, sliding_window=True, n_jobs=2)
+
+    assert scores['MRR'] == 0.5
+    assert round(scores['Precision'], 4) == 0.4167
+    assert round(scores['Recall'], 4) == 0.5833
+    assert scores == pytest.approx(scores_parallel)
+    assert get_precision(test_sessions, model, sliding_window=True, n_jobs=-1) == pytest.approx(scores['Precision'])
+
+
+def test_score_model_short_sessions():
+    test_sessions = [
+        [[1, 2, 3, 4], [1, 2, 3, 4]],
+        [[4, 1], [1, 2]]
+    ]
+
+    model = _get_model()
+
+    assert score_model(test_sessions, model) == score_model(test_sessions[:1], model)
+
+    with pytest.raises(TooShortSessionException):
+        score_model(test_sessions, model, skip_short_sessions=False)
+
+
+def test_score_model_sessions_generator():
+    test_sessions = [
+        [[1, 2, 3, 4], [1, 2, 3, 4]],
+        [[5, 6, 1, 2, 3], [1, 2, 3, 4, 5]]
+    ]
+
+    model = _get_model()
+
+    expected = score_model(test_sessions, model)
+    assert score_model((s for s in test_sessions), model, skip_short_sessions=False) == expected
+    assert score_model((s for s in test_sessions), model, n_jobs=2) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize('batch_size,cache_size', [(1, 1), (2, 3), (3, 2)])
+def test_score_model_small_batches_and_cache(monkeypatch, batch_size, cache_size):
+    test_sessions = [
+        [[1, 2, 3, 4], [1, 2, 3, 4]],
+        [[5, 6, 1, 2, 3], [1, 2, 3, 4, 5]],
+        [[1, 2, 3, 4], [5, 6, 7, 8]],
+        [[2, 5, 6], [1, 2, 3]]
+    ]
+
+    model = _get_model()
+    expected = score_model(test_sessions, model, sliding_window=True)
+
+    monkeypatch.setattr(metrics, '_PREDICTION_BATCH_SIZE', batch_size)
+    monkeypatch.setattr(metrics, '_PREDICTION_CACHE_SIZE', cache_size)
+
+    assert score_model(test_sessions, model, sliding_window=True) == expected
@@ -1,6 +1,16 @@
+import os
+import subprocess
+import sys
+
 import numpy as np
+from wsknn.weighting import weight_item_score, weight_session_items
+from wsknn.weighting.weighting import get_session_items_scorer
 from wsknn.weighting.session_weighting import linear_session_score, log_session_score, quadratic_session_score
 from wsknn.weighting.item_weighting import linear_item_score, inv_pos_item_score, quadratic_item_score, log_item_score
+from wsknn.weighting.vectorized import linear_session_score_vec, log_session_score_vec, quadratic_session_score_vec
+from wsknn.weighting.vectorized import linear_item_score_vec, inv_pos_item_score_vec, quadratic_item_score_vec,\
+    log_item_score_vec
+from wsknn.weighting.vectorized import weight_item_score_vec, weight_session_items_vec
 
 
 def test_session_log10():
@@ -64,3 +74,80 @@ def test_item_quadratic():
     for res in output:
         assert res <= 1
         assert res >= 0
+
+
+def test_vectorized_scores():
+    sequence_size = np.random.randint(1, 10000)
+    vals_range = np.arange(1, sequence_size, 1)
+
+    session_fns = [
+        (linear_session_score, linear_session_score_vec),
+        (log_session_score, log_session_score_vec),
+        (quadratic_session_score, quadratic_session_score_vec)
+    ]
+
+    for fn, fn_vec in session_fns:
+        expected = [fn(v, sequence_size) for v in vals_range]
+        assert np.allclose(fn_vec(vals_range, sequence_size), expected)
+
+    item_fns = [
+        (linear_item_score, linear_item_score_vec),
+        (inv_pos_item_score, inv_pos_item_score_vec),
+        (log_item_score, log_item_score_vec),
+        (quadratic_item_score, quadratic_item_score_vec)
+    ]
+
+    for fn, fn_vec in item_fns:
+        expected = [fn(v) for v in vals_range]
+        assert np.allclose(fn_vec(vals_range), expected)
+
+
+def test_weighting_dispatch_vec():
+    sequence_size = np.random.randint(2, 1000)
+    vals_range = np.arange(1, sequence_size, 1)
+
+    for fn_name in ['linear', 'log', 'quadratic']:
+        expected = [weight_session_items(fn_name, v, sequence_size) for v in vals_range]
+        assert np.allclose(weight_session_items_vec(fn_name, vals_range, sequence_size), expected)
+
+    for fn_name in ['linear', 'inv', 'log', 'quadratic', 'other']:
+        expected = [weight_item_score(fn_name, v) for v in vals_range]
+        assert np.allclose(weight_item_score_vec(fn_name, vals_range), expected)
+
+
+def test_session_log10_vec_out():
+    sequence_size = np.random.randint(1, 10000)
+    vals_range = np.arange(0, sequence_size, 1)
+    buffer = np.empty(sequence_size, dtype=np.float64)
+
+    output = log_session_score_vec(vals_range, sequence_size, out=buffer)
+
+    assert output is buffer
+    assert np.allclose(output, [log_session_score(v, sequence_size) for v in vals_range])
+
+
+def test_vectorized_scores_dtype():
+    vals_range = np.arange(1, 100, 1)
+
+    for fn_name in ['linear', 'log', 'quadratic']:
+        assert weight_session_items_vec(fn_name, vals_range, 100).dtype == np.float32
+
+    for fn_name in ['linear', 'inv', 'log', 'quadratic', 'other']:
+        assert weight_item_score_vec(fn_name, vals_range).dtype == np.float32
+
+
+def test_session_items_scorer():
+    sequence_size = np.random.randint(1, 1000)
+
+    for fn_name in ['linear', 'log', 'quadratic']:
+        scorer = get_session_items_scorer(fn_name, sequence_size)
+        for v in range(sequence_size):
+            assert np.isclose(scorer(v), weight_session_items(fn_name, v, sequence_size))
+
+
+def test_scalar_weighting_without_numpy():
+    # Scalar weighting functions don't import numpy, it is checked in a new interpreter
+    code = ('import sys; import wsknn.weighting; import wsknn.weighting.session_weighting; '
+            'assert "numpy" not in sys.modules')
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=package_dir)
@@ -1,5 +1,10 @@
+import os
+import subprocess
+import sys
+
 import pytest
 from wsknn.model.wsknn import WSKNN
+from wsknn.predict import predict
 from wsknn.utils.errors import InvalidDimensionsError, InvalidTimestampError
 
 
@@ -164,3 +169,143 @@ def test_wsknn_with_weights():
     for idx, sess in enumerate(some_sessions):
         recomms = model.recommend(sess)
         assert recomms == expected_recommendations[idx]
+
+
+def test_batch_recommendations():
+    sessions = {
+        'a': [
+            [1, 2, 3, 4, 5],
+            [1, 2, 3, 4, 5]
+        ],
+        'b': [
+            [2, 3, 4, 5],
+            [10, 11, 12, 13]
+        ]
+    }
+
+    items = {
+        1: [['a'], [1]],
+        2: [['a', 'b'], [2]],
+        3: [['a', 'b'], [3]],
+        4: [['a', 'b'], [4]],
+        5: [['a', 'b'], [5]]
+    }
+
+    some_sessions = {
+        'x': [[1], [100]],
+        'y': [[2, 3], [200, 300]]
+    }
+
+    expected_recommendations = {
+        'x': [(2, 2.0), (3, 2.0), (4, 2.0), (5, 2.0)],
+        'y': [(4, 2.5), (5, 2.5), (1, 1.25)]
+    }
+
+    model = WSKNN(return_events_from_session=False)
+    model.fit(sessions, items)
+
+    assert model.recommend_batch(some_sessions) == expected_recommendations
+    assert predict(model, some_sessions) == expected_recommendations
+
+
+def test_batch_recommendations_duplicated_sessions():
+    sessions = {
+        'a': [
+            [1, 2, 3, 4, 5],
+            [1, 2, 3, 4, 5]
+        ],
+        'b': [
+            [2, 3, 4, 5],
+            [10, 11, 12, 13]
+        ]
+    }
+
+    items = {
+        1: [['a'], [1]],
+        2: [['a', 'b'], [2]],
+        3: [['a', 'b'], [3]],
+        4: [['a', 'b'], [4]],
+        5: [['a', 'b'], [5]]
+    }
+
+    some_sessions = {
+        'x': [[2, 3], [200, 300]],
+        'y': [[2, 3], [400, 500]],
+        'z': [[1], [100]]
+    }
+
+    model = WSKNN(return_events_from_session=False)
+    model.fit(sessions, items)
+
+    recommendations = model.recommend_batch(some_sessions)
+
+    assert recommendations['x'] == recommendations['y'] == [(4, 2.5), (5, 2.5), (1, 1.25)]
+    assert recommendations['x'] is not recommendations['y']
+    assert recommendations['z'] == model.recommend(some_sessions['z'])
+
+
+def test_recommendations_tied_scores():
+    # Items 2 and 5 have equal scores, similarities are summed in the item code order and it decides their order
+    sessions = {
+        0: [[4, 1, 6, 5], [0, 1, 2, 3]],
+        1: [[5, 4], [10, 11]],
+        2: [[3, 4, 7, 1, 6, 2], [20, 21, 22, 23, 24, 25]]
+    }
+
+    items = dict()
+    for session_id, (session_items, timestamps) in sessions.items():
+        for item in session_items:
+            items.setdefault(item, [[], [timestamps[0]]])[0].append(session_id)
+
+    some_session = [[0, 7, 3, 1, 6, 4], [0, 1, 2, 3, 4, 5]]
+
+    model = WSKNN(number_of_recommendations=5, return_events_from_session=False)
+    model.fit(sessions, items)
+
+    recommendations = model.recommend(some_session)
+
+    assert [item for item, _ in recommendations] == [5, 2]
+    assert [rank for _, rank in recommendations] == pytest.approx([25 / 36, 25 / 36])
+    assert model.recommend_batch({'x': some_session}) == {'x': recommendations}
+
+
+def test_wsknn_weights_index_changed():
+    sessions = {
+        0: [['1', '2', '3'], [1, 2, 3], [0.9, 0.9, 0.9], [0.1, 0.1, 0.1]],
+        1: [['2', '4'], [10, 11], [0.1, 0.2], [0.8, 0.9]]
+    }
+
+    items = {
+        '1': [[0], [1]],
+        '2': [[0, 1], [2]],
+        '3': [[0], [3]],
+        '4': [[1], [10]]
+    }
+
+    some_session = [['2'], [100]]
+
+    model = WSKNN(return_events_from_session=False,
+                  sampling_strategy='weighted_events',
+                  sampling_event_weights_index=2,
+                  sample_size=1)
+    model.fit(sessions, items)
+
+    fresh_model = WSKNN(return_events_from_session=False,
+                        sampling_strategy='weighted_events',
+                        sampling_event_weights_index=3,
+                        sample_size=1)
+    fresh_model.fit(sessions, items)
+
+    assert [item for item, _ in model.recommend(some_session)] == ['1', '3']
+
+    model.sampling_event_weights_index = 3
+    assert model.recommend(some_session) == fresh_model.recommend(some_session) == [('4', 2.0)]
+
+
+def test_package_imports_after_predict_submodule():
+    # The wsknn.predict submodule must not shadow the predict() function, it is checked in a new interpreter
+    code = ('import sys; import wsknn.predict; from wsknn import predict; import wsknn; '
+            'assert callable(predict) and wsknn.predict is predict; assert "numpy" not in sys.modules; '
+            'from wsknn import *; assert callable(predict) and WSKNN.__name__ == "WSKNN"')
+    package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    subprocess.run([sys.executable, '-c', code], check=True, cwd=package_dir)
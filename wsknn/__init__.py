@@ -1,6 +1,27 @@
+from importlib import import_module as _import_module
+
 from wsknn.fit_transform import fit
 from wsknn.predict import predict
-from wsknn.model.wsknn import WSKNN
 
 
-__version__ = '0.1.5'
+__version__ = '0.1.6'
+
+# The model is imported on the first access, so reading the package metadata (setup.py, docs) doesn't load numpy.
+#     fit() and predict() are bound eagerly, the wsknn.predict submodule would shadow a lazy predict()
+_LAZY_IMPORTS = {
+    'WSKNN': 'wsknn.model.wsknn'
+}
+
+__all__ = ['fit', 'predict', 'WSKNN']
+
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        obj = getattr(_import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
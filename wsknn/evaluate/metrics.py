@@ -1,11 +1,21 @@
-from typing import Dict, List, Tuple
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Tuple
 
-import numpy as np
 from wsknn.model.wsknn import WSKNN
-from wsknn.evaluate.scores.scores import mrr_func, precision_func, recall_func
+from wsknn.evaluate.scores.scores import scores_func
 from wsknn.utils.errors import TooShortSessionException
 
 
+# Number of evaluation windows predicted with a single recommend_batch() call
+_PREDICTION_BATCH_SIZE = 1000
+
+# Number of the most recently used test sessions with cached recommendations
+_PREDICTION_CACHE_SIZE = 100000
+
+
 def score_model(sessions: List,
                 trained_model: WSKNN,
                 k=0,
@@ -13,7 +23,8 @@ def score_model(sessions: List,
                 calc_mrr: bool = True,
                 calc_precision: bool = True,
                 calc_recall: bool = True,
-                sliding_window: bool = False) -> Dict:
+                sliding_window: bool = False,
+                n_jobs: int = 1) -> Dict:
     """
     Function get Precision@k, Recall@k and MRR@k.
 
@@ -50,51 +61,50 @@ def score_model(sessions: List,
                      When calculating metrics slide through a single session up to the point when it is not possible
                      to have the same number of evaluation products as the number of recommendations.
 
+    n_jobs : int, default = 1
+             Number of processes scoring sessions. The trained model is copied once to each process, or inherited
+             without copying if the default start method of processes is fork. If -1 then all CPUs are used.
+
     Returns
     -------
     : Dict
     {'MRR': float, 'Recall': float, 'Precision': float}
     """
-    mrrs = list()
-    precisions = list()
-    recalls = list()
-
     k, trained_model = _set_number_of_recommendations(k, trained_model)
 
-    for session in sessions:
-
-        s_length = len(session[0])
-        session_length_test = _should_skip_short_session(s_length, k, skip_short_sessions)
-
-        if session_length_test:
-            # Session is too short to make any valuable scoring
-            pass
-        else:
-            eval_items, predictions = _prepare_metrics_data(session, trained_model, sliding_window)
-
-            for i in range(len(eval_items)):
-                recommendations = predictions[i]
-                recommendations = [x[0] for x in recommendations]  # We are not interested in the weights
-                evaluation_items = eval_items[i]
-
-                # Get rank
-                if calc_mrr:
-                    partial_rank = mrr_func(recommendations, evaluation_items)
-                    mrrs.append(partial_rank)
-
-                # Get precisions
-                if calc_precision:
-                    partial_precision = precision_func(recommendations, evaluation_items)
-                    precisions.append(partial_precision)
-
-                # Get recalls
-                if calc_recall:
-                    partial_recall = recall_func(recommendations, evaluation_items)
-                    recalls.append(partial_recall)
+    # Sessions are read more than once (length check, chunks of the parallel scoring)
+    sessions = list(sessions)
+
+    if not skip_short_sessions:
+        _check_sessions_length(sessions, k)
+
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+
+    if not (calc_mrr or calc_precision or calc_recall):
+        # Nothing to evaluate
+        mrr_sum, precision_sum, recall_sum, n_windows = 0, 0, 0, 0
+    elif n_jobs > 1 and len(sessions) > 1:
+        chunk_size = -(-len(sessions) // (4 * n_jobs))
+        chunks = [sessions[i:i + chunk_size] for i in range(0, len(sessions), chunk_size)]
+        partial_results = list()
+
+        with ProcessPoolExecutor(max_workers=n_jobs,
+                                 initializer=_init_worker,
+                                 initargs=(trained_model,)) as executor:
+            for partial_scores in executor.map(_score_chunk,
+                                               chunks,
+                                               [k] * len(chunks),
+                                               [sliding_window] * len(chunks)):
+                partial_results.append(partial_scores)
+
+        mrr_sum, precision_sum, recall_sum, n_windows = (sum(partial_sums) for partial_sums in zip(*partial_results))
+    else:
+        mrr_sum, precision_sum, recall_sum, n_windows = _score_sessions(sessions, trained_model, k, sliding_window)
 
-    mrr = float(np.mean(mrrs))
-    prec = float(np.mean(precisions))
-    rec = float(np.mean(recalls))
+    mrr = mrr_sum / n_windows if calc_mrr and n_windows else float('nan')
+    prec = precision_sum / n_windows if calc_precision and n_windows else float('nan')
+    rec = recall_sum / n_windows if calc_recall and n_windows else float('nan')
 
     scores = {
         'MRR': mrr,
@@ -109,7 +119,8 @@ def get_mean_reciprocal_rank(sessions: List,
                              trained_model: WSKNN,
                              k=0,
                              skip_short_sessions=True,
-                             sliding_window=False) -> float:
+                             sliding_window=False,
+                             n_jobs: int = 1) -> float:
     """
     The function calculates the mean reciprocal rank of a top k recommendations.
     Given session must be longer than k events.
@@ -138,42 +149,32 @@ def get_mean_reciprocal_rank(sessions: List,
                      When calculating metrics slide through a single session up to the point when it is not possible
                      to have the same number of evaluation products as the number of recommendations.
 
+    n_jobs : int, default = 1
+             Number of processes scoring sessions. See score_model().
+
     Returns
     -------
     : float
         Mean Reciprocal Rank: The average score of MRR per n sessions.
     """
-    mrrs = list()
-
-    k, trained_model = _set_number_of_recommendations(k, trained_model)
-
-    for session in sessions:
-
-        s_length = len(session[0])
-        session_length_test = _should_skip_short_session(s_length, k, skip_short_sessions)
-        if session_length_test:
-            # Session is too short to make any valuable scoring
-            pass
-        else:
-            eval_items, predictions = _prepare_metrics_data(session, trained_model, sliding_window)
-
-            # Get rank
-            for i in range(len(eval_items)):
-                recommendations = predictions[i]
-                recommendations = [x[0] for x in recommendations]  # We are not interested in the weights
-                evaluation_items = eval_items[i]
-                partial_rank = mrr_func(recommendations, evaluation_items)
-                mrrs.append(partial_rank)
-
-    mrr = np.mean(mrrs)
-    return float(mrr)
+    scores = score_model(sessions,
+                         trained_model,
+                         k=k,
+                         skip_short_sessions=skip_short_sessions,
+                         calc_mrr=True,
+                         calc_precision=False,
+                         calc_recall=False,
+                         sliding_window=sliding_window,
+                         n_jobs=n_jobs)
+    return scores['MRR']
 
 
 def get_precision(sessions: List,
                   trained_model: WSKNN,
                   k=0,
                   skip_short_sessions=True,
-                  sliding_window=False) -> float:
+                  sliding_window=False,
+                  n_jobs: int = 1) -> float:
     """
     The function calculates the precision score of a top k recommendations.
     Given session must be longer than k events.
@@ -202,6 +203,9 @@ def get_precision(sessions: List,
                      When calculating metrics slide through a single session up to the point when it is not possible
                      to have the same number of evaluation products as the number of recommendations.
 
+    n_jobs : int, default = 1
+             Number of processes scoring sessions. See score_model().
+
     Returns
     -------
     : float
@@ -211,40 +215,24 @@ def get_precision(sessions: List,
     -----
     Precision is defined as (no of recommendations that are relevant) / (number of items recommended).
     """
-
-    precisions = list()
-
-    k, trained_model = _set_number_of_recommendations(k, trained_model)
-
-    for session in sessions:
-
-        s_length = len(session[0])
-
-        session_length_test = _should_skip_short_session(s_length, k, skip_short_sessions)
-
-        if session_length_test:
-            # Session is too short to make any valuable scoring
-            pass
-        else:
-            eval_items, predictions = _prepare_metrics_data(session, trained_model, sliding_window)
-
-            # Get rank
-            for i in range(len(eval_items)):
-                recommendations = predictions[i]
-                recommendations = [x[0] for x in recommendations]  # We are not interested in the weights
-                evaluation_items = eval_items[i]
-                partial_precision = precision_func(recommendations, evaluation_items)
-                precisions.append(partial_precision)
-
-    precision = np.mean(precisions)
-    return float(precision)
+    scores = score_model(sessions,
+                         trained_model,
+                         k=k,
+                         skip_short_sessions=skip_short_sessions,
+                         calc_mrr=False,
+                         calc_precision=True,
+                         calc_recall=False,
+                         sliding_window=sliding_window,
+                         n_jobs=n_jobs)
+    return scores['Precision']
 
 
 def get_recall(sessions: List,
                trained_model: WSKNN,
                k=0,
                skip_short_sessions=True,
-               sliding_window=False) -> float:
+               sliding_window=False,
+               n_jobs: int = 1) -> float:
     """
     The function calculates the recall score of a top k recommendations.
     Given session must be longer than k events.
@@ -273,6 +261,9 @@ def get_recall(sessions: List,
                      When calculating metrics slide through a single session up to the point when it is not possible
                      to have the same number of evaluation products as the number of recommendations.
 
+    n_jobs : int, default = 1
+             Number of processes scoring sessions. See score_model().
+
     Returns
     -------
     : float
@@ -282,70 +273,198 @@ def get_recall(sessions: List,
     -----
     Recall is defined as (no of recommendations that are relevant) / (all relevant items for a user).
     """
-    recalls = list()
+    scores = score_model(sessions,
+                         trained_model,
+                         k=k,
+                         skip_short_sessions=skip_short_sessions,
+                         calc_mrr=False,
+                         calc_precision=False,
+                         calc_recall=True,
+                         sliding_window=sliding_window,
+                         n_jobs=n_jobs)
+    return scores['Recall']
 
-    k, trained_model = _set_number_of_recommendations(k, trained_model)
 
-    for session in sessions:
+# Model used by the score_model() worker processes
+_WORKER_MODEL = None
 
-        s_length = len(session[0])
 
-        session_length_test = _should_skip_short_session(s_length, k, skip_short_sessions)
+def _init_worker(trained_model: WSKNN):
+    global _WORKER_MODEL
+    _WORKER_MODEL = trained_model
 
-        if session_length_test:
-            # Session is too short to make any valuable scoring
-            pass
+
+def _score_chunk(sessions, k, sliding_window):
+    return _score_sessions(sessions, _WORKER_MODEL, k, sliding_window)
+
+
+def _score_sessions(sessions: List,
+                    trained_model: WSKNN,
+                    k: int,
+                    sliding_window: bool) -> Tuple[float, float, float, int]:
+    """
+    Function scores recommendations for each session, sessions not longer than k are skipped.
+
+    Parameters
+    ----------
+    sessions : List of sessions
+
+    trained_model : WSKNN
+                    Trained VSKNN model with the number of recommendations set to k.
+
+    k : int
+        Number of top recommendations.
+
+    sliding_window : bool
+                     See score_model() sliding_window parameter.
+
+    Returns
+    -------
+    : Tuple[float, float, float, int]
+        Sums of MRR, Precision and Recall over the evaluated windows, and the number of windows.
+    """
+    windows = _iter_windows(sessions, k, sliding_window)
+
+    mrr_sum = 0
+    precision_sum = 0
+    recall_sum = 0
+    n_windows = 0
+
+    # Repeated test sessions are predicted once if model is deterministic
+    cache = OrderedDict() if trained_model.has_deterministic_predictions() else None
+
+    # Windows are predicted in batches to bound memory
+    while True:
+        batch = list(islice(windows, _PREDICTION_BATCH_SIZE))
+        if not batch:
+            break
+
+        test_sessions, eval_items = zip(*batch)
+
+        if cache is None:
+            predictions = trained_model.recommend_batch(dict(enumerate(test_sessions)))
         else:
-            eval_items, predictions = _prepare_metrics_data(session, trained_model, sliding_window)
+            predictions = _recommend_cached(trained_model, test_sessions, cache)
+
+        for i in range(len(eval_items)):
+            recommendations = predictions[i]
+            recommendations = [x[0] for x in recommendations]  # We are not interested in the weights
+            evaluation_items = eval_items[i]
 
-            # Get rank
-            for i in range(len(eval_items)):
-                recommendations = predictions[i]
-                recommendations = [x[0] for x in recommendations]  # We are not interested in the weights
-                evaluation_items = eval_items[i]
-                partial_recall = recall_func(recommendations, evaluation_items)
+            # Get rank, precision and recall in one pass
+            partial_rank, partial_precision, partial_recall = scores_func(recommendations, evaluation_items)
 
-                recalls.append(partial_recall)
+            mrr_sum += partial_rank
+            precision_sum += partial_precision
+            recall_sum += partial_recall
 
-    recall = np.mean(recalls)
-    return float(recall)
+        n_windows += len(eval_items)
 
+    return mrr_sum, precision_sum, recall_sum, n_windows
 
-def _prepare_metrics_data(session, trained_model, sliding_window):
+
+def _recommend_cached(trained_model: WSKNN, test_sessions: Tuple, cache: OrderedDict) -> List:
     """
-    Function prepares metrics data.
+    Function predicts test sessions which are not in the LRU cache of recommendations.
 
     Parameters
     ----------
-    session : Any
-              Array or list with a session.
-
     trained_model : WSKNN
-                    Model to make predictions.
+                    Model with deterministic predictions.
 
-    sliding_window : bool, default = False
-                     When calculating metrics slide through a single session up to the point when it is not possible
-                     to have the same number of evaluation products as the number of recommendations.
+    test_sessions : Tuple
+                    Sessions to predict.
+
+    cache : OrderedDict
+            Recommendations of the recently predicted sessions, {tuple(session items): recommendations}. It is
+            updated in place.
 
     Returns
     -------
+    : List
+        Recommendations of each test session.
+    """
+    keys = [tuple(test_session[0]) for test_session in test_sessions]
+
+    missing = dict()
+    for key, test_session in zip(keys, test_sessions):
+        if key in cache:
+            cache.move_to_end(key)
+        else:
+            missing[key] = test_session
+
+    if missing:
+        cache.update(trained_model.recommend_batch(missing))
+
+    predictions = [cache[key] for key in keys]
+
+    while len(cache) > _PREDICTION_CACHE_SIZE:
+        cache.popitem(last=False)
+
+    return predictions
+
+
+def _iter_windows(sessions: List, k: int, sliding_window: bool) -> Iterator:
+    """
+    Function yields evaluation windows of sessions longer than k.
+
+    Parameters
+    ----------
+    sessions : List of sessions
+
+    k : int
+        Number of top recommendations.
+
+    sliding_window : bool
+                     See score_model() sliding_window parameter.
+
+    Yields
+    ------
     : Tuple[List, List]
-        (relevant items, recommended items)
+        (test session, relevant items)
     """
-    relevant_items, recommends = _get_test_eval_preds(session, trained_model, sliding_window)
-    return relevant_items, recommends
+    for session in sessions:
+        if len(session[0]) <= k:
+            # Session is too short to make any valuable scoring
+            continue
 
-def _get_test_eval_preds(session, trained_model: WSKNN, sliding_window: bool):
+        test_sessions, eval_items = _get_test_eval_sessions(session, k, sliding_window)
+        yield from zip(test_sessions, eval_items)
+
+
+def _check_sessions_length(sessions: List, k: int):
     """
-    Function parses session into test session, evaluation items (relevant items), and recommendations.
+    Function checks if all sessions are longer than the number of recommendations -> otherwise it is not possible
+    to clip session into a prediction and evaluation parts.
+
+    Parameters
+    ----------
+    sessions : List of sessions
+
+    k : int
+        Number of top recommendations.
+
+    Raises
+    ------
+    TooShortSessionException : Raised for the first session with length <= k.
+    """
+    for session in sessions:
+        s_length = len(session[0])
+        if s_length <= k:
+            raise TooShortSessionException(s_length, k)
+
+
+def _get_test_eval_sessions(session, k: int, sliding_window: bool):
+    """
+    Function parses session into test sessions and evaluation items (relevant items).
 
     Parameters
     ----------
     session : Any
               Array or list with a session.
 
-    trained_model : WSKNN
-                    Model to make predictions.
+    k : int
+        Number of recommendations.
 
     sliding_window : bool, default = False
                      When calculating metrics slide through a single session up to the point when it is not possible
@@ -354,33 +473,23 @@ def _get_test_eval_preds(session, trained_model: WSKNN, sliding_window: bool):
     Returns
     -------
     : Tuple[List, List]
-        (relevant items, recommended items)
+        (test sessions, relevant items)
     """
-    recommended_items_list = list()
+    test_sessions = list()
     relevant_items_list = list()
 
     session_range = len(session[0])
-    k = trained_model.n_of_recommendations
 
     if sliding_window:
         srange = range(session_range-k, session_range)
         for i in srange:
-            test_session = [x[:i] for x in session]
-            relevant_items = session[0][i:]
-            recommended_items = trained_model.recommend(test_session)
-
-            recommended_items_list.append(recommended_items)
-            relevant_items_list.append(relevant_items)
+            test_sessions.append([x[:i] for x in session])
+            relevant_items_list.append(session[0][i:])
     else:
+        test_sessions.append([x[:k] for x in session])
+        relevant_items_list.append(session[0][k:])
 
-        test_session = [x[:k] for x in session]
-        recommended_items = trained_model.recommend(test_session)
-        relevant_items = session[0][k:]
-
-        recommended_items_list.append(recommended_items)
-        relevant_items_list.append(relevant_items)
-
-    return relevant_items_list, recommended_items_list
+    return test_sessions, relevant_items_list
 
 
 def _set_number_of_recommendations(k: int, wsknn_model: WSKNN) -> Tuple[int, WSKNN]:
@@ -410,36 +519,3 @@ def _set_number_of_recommendations(k: int, wsknn_model: WSKNN) -> Tuple[int, WSK
 
     return k, wsknn_model
 
-
-def _should_skip_short_session(s_length: int, k: int, skip_short: bool) -> bool:
-    """
-    Function checks if session length is smaller than number of recommendations -> in this case it is not possible
-    to clip session into a prediction and evaluation parts.
-
-    Parameters
-    ----------
-    s_length : int
-               The length of a session.
-
-    k : int
-        The number of neighbors.
-
-    skip_short : bool
-                 If True then nothing happens even if session is short. Else error is raised.
-
-    Returns
-    -------
-    : bool
-        True, if session is too short and should be skipped.
-
-    Raises
-    ------
-    TooShortSessionException : Raised if session length is < k and if skip_short parameter is set to False.
-    """
-    if s_length <= k:
-        if skip_short:
-            return True
-        else:
-            raise TooShortSessionException(s_length, k)
-    else:
-        return False
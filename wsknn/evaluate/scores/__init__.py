@@ -1 +1 @@
-from wsknn.evaluate.scores.scores import mrr_func, precision_func, recall_func
+from wsknn.evaluate.scores.scores import mrr_func, precision_func, recall_func, scores_func
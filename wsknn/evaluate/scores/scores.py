@@ -1,3 +1,17 @@
+from typing import Tuple
+
+
+def _as_set(items):
+    if isinstance(items, (set, frozenset)):
+        return items
+    return set(items)
+
+
+def _count_hits(recommendations, relevant_set) -> int:
+    # Membership tests are mapped in C, duplicated recommendations are counted as separate hits
+    return sum(map(relevant_set.__contains__, recommendations))
+
+
 def mrr_func(recommendations, relevant_items):
     """
     Function calculates the mean reciprocal rank of a top k recommendations.
@@ -8,7 +22,7 @@ def mrr_func(recommendations, relevant_items):
         The set recommended products, sorted from the most relevant items into the least.
 
     relevant_items
-        The set of relevant items.
+        The set of relevant items. Pass set or frozenset to skip the conversion.
 
     Returns
     -------
@@ -17,10 +31,11 @@ def mrr_func(recommendations, relevant_items):
            where:
            - idx_rel: index of the first occurence of ANY relevant product in recommended items.
     """
+    relevant_set = _as_set(relevant_items)
+
     for idx, item in enumerate(recommendations):
-        ii = idx + 1
-        if item in relevant_items:
-            rank = 1 / ii
+        if item in relevant_set:
+            rank = 1 / (idx + 1)
             return rank
     return 0
 
@@ -35,20 +50,17 @@ def precision_func(recommendations, relevant_items):
         The set recommended products, sorted from the most relevant items into the least.
 
     relevant_items
-        The set of relevant items.
+        The set of relevant items. Pass set or frozenset to skip the conversion.
 
     Returns
     -------
     precision : float
-                (Number of relevant items in recommendations) / (Number of recommendations)
+                (Number of relevant items in recommendations) / (Number of recommendations), 0 if there are no
+                recommendations.
     """
-    rank = 0
+    rank = _count_hits(recommendations, _as_set(relevant_items))
 
-    for item in recommendations:
-        if item in relevant_items:
-            rank = rank + 1
-
-    precision = rank / len(recommendations)
+    precision = rank / len(recommendations) if recommendations else 0
     return precision
 
 
@@ -70,11 +82,39 @@ def recall_func(recommendations, relevant_items):
              (Number of relevant items in recommendations) / (Number of relevant items for the user)
     """
 
-    rank = 0
-
-    for item in recommendations:
-        if item in relevant_items:
-            rank = rank + 1
+    rank = _count_hits(recommendations, _as_set(relevant_items))
 
     recall = rank / len(relevant_items)
     return recall
+
+
+def scores_func(recommendations, relevant_items) -> Tuple[float, float, float]:
+    """
+    Function calculates the mean reciprocal rank, precision and recall of a top k recommendations in a single pass.
+
+    Parameters
+    ----------
+    recommendations
+        The set recommended products, sorted from the most relevant items into the least.
+
+    relevant_items
+        The set of relevant items.
+
+    Returns
+    -------
+    rank, precision, recall : Tuple[float, float, float]
+        The same values as mrr_func(), precision_func() and recall_func().
+    """
+    relevant_set = _as_set(relevant_items)
+
+    rank = 0
+    hits = 0
+    for idx, item in enumerate(recommendations):
+        if item in relevant_set:
+            if hits == 0:
+                rank = 1 / (idx + 1)
+            hits += 1
+
+    precision = hits / len(recommendations) if recommendations else 0
+    recall = hits / len(relevant_items)
+    return rank, precision, recall
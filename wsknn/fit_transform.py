@@ -1,6 +1,7 @@
-from typing import Dict, Union
+from typing import TYPE_CHECKING, Dict, Union
 
-from wsknn.model.wsknn import WSKNN
+if TYPE_CHECKING:
+    from wsknn.model.wsknn import WSKNN
 
 
 def fit(sessions: Dict,
@@ -15,7 +16,7 @@ def fit(sessions: Dict,
         required_sampling_event: Union[int, str] = None,
         required_sampling_event_index: int = None,
         sampling_str_event_weights_index: int = None,
-        recommend_any: bool = False):
+        recommend_any: bool = False) -> 'WSKNN':
     """
 
     Sets input session-items and item-sessions maps.
@@ -111,6 +112,9 @@ def fit(sessions: Dict,
     >>> fitted_model = fit(input_sessions, input_items)
     """
 
+    # The model (and numpy) is imported on the first fit
+    from wsknn.model.wsknn import WSKNN
+
     # Set model parameters
     wsknn = WSKNN(number_of_recommendations=number_of_recommendations,
                   number_of_neighbors=number_of_neighbors,
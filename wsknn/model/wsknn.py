@@ -1,9 +1,11 @@
 import random
+from itertools import chain
 import numpy as np
 from typing import Iterable, Union, List, Set, Dict
 
-from wsknn.weighting import weight_session_items, weight_item_score
-from wsknn.utils.calc import weight_set_pair
+from wsknn.weighting import weight_item_score
+from wsknn.weighting.weighting import get_session_items_scorer
+from wsknn.utils.calc import csr_rows_positions, weight_csc_rows
 from wsknn.utils.errors import check_data_dimension, check_numeric_type_instance,\
     InvalidDimensionsError, InvalidTimestampError
 
@@ -82,6 +84,12 @@ class WSKNN:
                        }
                        Dict populated with fit() method.
 
+    session_item_sets : Dict
+                        sessions = {
+                            session_id: frozenset(sequence_of_items)
+                        }
+                        Unique items of each session, precomputed with fit() method for the similarity lookups.
+
     n_of_recommendations : int
                            Number of items recommended.
 
@@ -120,6 +128,8 @@ class WSKNN:
 
     recommend()
 
+    recommend_batch()
+
     set_model_params()
 
     Raises
@@ -174,6 +184,21 @@ class WSKNN:
 
         self.session_item_map = None
         self.item_session_map = None
+        self.session_item_sets = None
+
+        # Items interned to int codes, sessions of each item (posting lists) and session sequences stored as
+        #     CSC / CSR matrices (rows - sessions, columns - items)
+        self._item_codes = None
+        self._code_items = None
+        self._session_rows = None
+        self._item_indptr = None
+        self._item_indices = None
+        self._sequence_indptr = None
+        self._sequence_indices = None
+        # Mean event weight of each session, calculated with the first weighted_events sampling, and the index of
+        #     weights it was calculated for
+        self._session_weights_mean = None
+        self._session_weights_mean_index = None
 
         self.n_of_recommendations = number_of_recommendations
         self.number_of_closest_neighbors = number_of_neighbors
@@ -222,6 +247,10 @@ class WSKNN:
 
         self.session_item_map = sessions
         self.item_session_map = items
+        self.session_item_sets = {
+            session_id: frozenset(session[0]) for session_id, session in sessions.items()
+        }
+        self._index_sessions(sessions)
 
     def recommend(self,
                   event_stream: List,
@@ -258,6 +287,76 @@ class WSKNN:
 
         return recommendations
 
+    def recommend_batch(self,
+                        event_streams: Dict,
+                        settings: dict = None) -> Dict:
+        """
+        The method predicts n next recommendations for multiple sessions at once.
+
+        Parameters
+        ----------
+        event_streams : Dict
+            Sessions for recommendation. Each session must be a nested List of lists:
+            {
+                session_id: [
+                    [items],
+                    [timestamps],
+                    [(optional) event names],
+                    [(optional) weights]
+                ]
+            }
+
+        settings : Dict, default = None
+                   Model settings and parameters. They are set once for the whole batch.
+
+        Returns
+        -------
+        recommendations : Dict
+            {
+                session_id: [
+                    (item a, rank a), (item b, rank b)
+                ]
+            }
+
+        Notes
+        -----
+        If sampling strategy is not random and recommend_any is False then the recommendations depend only on
+        the sequence of items, and sessions with the same items are predicted once.
+        """
+
+        if settings is not None:
+            self.set_model_params(**settings)
+
+        predict = self._predict
+
+        if not self.has_deterministic_predictions():
+            recommendations = {
+                session_id: predict(event_stream) for session_id, event_stream in event_streams.items()
+            }
+            return recommendations
+
+        predicted = dict()
+        recommendations = dict()
+        for session_id, event_stream in event_streams.items():
+            key = tuple(event_stream[0])
+            if key not in predicted:
+                predicted[key] = predict(event_stream)
+            recs = predicted[key]
+            recommendations[session_id] = recs if recs is None else recs.copy()
+
+        return recommendations
+
+    def has_deterministic_predictions(self) -> bool:
+        """Method checks if recommendations depend only on the sequence of items. It is true if sessions are not
+        sampled randomly and random items are not added to the recommendations.
+
+        Returns
+        -------
+        : bool
+            True if sessions with the same items always get the same recommendations.
+        """
+        return self.sampling_strategy != 'random' and not self.recommend_any
+
     def set_model_params(self,
                          number_of_recommendations=None,
                          number_of_neighbors=None,
@@ -374,7 +473,6 @@ class WSKNN:
                 return recommendations
         else:
             ranked_items = self._rank_items(neighbors, session)
-            ranked_items.sort(key=lambda x: x[1], reverse=True)
             recommendations = ranked_items[:self.n_of_recommendations]
 
             if self.recommend_any:
@@ -383,6 +481,67 @@ class WSKNN:
 
             return recommendations
 
+    def _index_sessions(self, sessions: Dict):
+        """Method interns items to int codes and stores sessions of each item as a CSC matrix and items sequence of
+        each session as a CSR matrix.
+
+        Parameters
+        ----------
+        sessions : Dict
+                   sessions = {
+                       session_id: (
+                           [ sequence_of_items ],
+                           [ sequence_of_timestamps ],
+                           [ [OPTIONAL] sequence_of_event_types ]
+                       )
+                   }
+        """
+        item_codes = dict()
+        session_rows = dict()
+        indices = list()
+        indptr = [0]
+        sequences = list()
+        sequences_indptr = [0]
+
+        for session_id, session in sessions.items():
+            session_rows[session_id] = len(session_rows)
+            codes = [item_codes.setdefault(item, len(item_codes)) for item in session[0]]
+            sequences.extend(codes)
+            sequences_indptr.append(len(sequences))
+            indices.extend(sorted(set(codes)))
+            indptr.append(len(indices))
+
+        self._item_codes = item_codes
+        self._code_items = list(item_codes.keys())
+        self._session_rows = session_rows
+
+        # Transpose unique session items into posting lists, stable sort keeps session rows ascending
+        indices = np.array(indices, dtype=np.int32)
+        rows = np.repeat(np.arange(len(session_rows), dtype=np.int32), np.diff(indptr))
+        self._item_indptr = np.concatenate(([0], np.cumsum(np.bincount(indices, minlength=len(item_codes)))))
+        self._item_indices = rows[np.argsort(indices, kind='stable')]
+        self._sequence_indptr = np.array(sequences_indptr, dtype=np.int64)
+        self._sequence_indices = np.array(sequences, dtype=np.int32)
+        self._session_weights_mean = None
+        self._session_weights_mean_index = None
+
+    def _mean_session_weights(self) -> np.ndarray:
+        """Method calculates mean of the event weights of each session, rows are ordered as in the sessions index.
+
+        Returns
+        -------
+        : numpy array
+          Mean event weight per session, NaN if session has no weights.
+        """
+        weights_index = self.sampling_event_weights_index
+        weights = [session[weights_index] for session in self.session_item_map.values()]
+        lengths = np.fromiter(map(len, weights), dtype=np.int64, count=len(weights))
+        flat_weights = np.fromiter(chain.from_iterable(weights), dtype=np.float64, count=lengths.sum())
+        sums = np.bincount(np.repeat(np.arange(len(weights)), lengths), weights=flat_weights, minlength=len(weights))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return sums / lengths
+
     def _get_more_items(self, recommendations):
         add_items_size = self.n_of_recommendations - len(recommendations)
         possible_items = list(self.item_session_map.keys())
@@ -420,8 +579,8 @@ class WSKNN:
             Wrong type of a given structure.
         """
 
-        # Get sample record
-        sample_key = random.choice(list(sessions.keys()))
+        # Get sample record, any record is good enough and the first one doesn't need a copy of all keys
+        sample_key = next(iter(sessions))
 
         sample_rec = sessions[sample_key]
 
@@ -469,8 +628,8 @@ class WSKNN:
 
         """
 
-        # Get sample record
-        sample_key = random.choice(list(items.keys()))
+        # Get sample record, any record is good enough and the first one doesn't need a copy of all keys
+        sample_key = next(iter(items))
 
         sample_rec = items[sample_key]
 
@@ -659,35 +818,45 @@ class WSKNN:
           List of rated items in descending order.
         """
         session_items = session[0]
-        scores = dict()
+        rows = np.empty(len(closest_neighbors), dtype=np.int64)
+        weights = np.empty(len(closest_neighbors), dtype=np.float64)
 
-        for neighbor in closest_neighbors:
-            n_items = self.session_item_map[neighbor[0]][0]
+        for idx, neighbor in enumerate(closest_neighbors):
+            n_items_set = self.session_item_sets[neighbor[0]]
             step = 1
             decay = 1
             for s_item in reversed(session_items):
-                if s_item in n_items:
+                if s_item in n_items_set:
                     decay = weight_item_score(self.ranking_strategy, step)
                     break
                 step = step + 1
 
-            for n_item in n_items:
-                if n_item in session_items and not self.return_events_from_session:
-                    pass
-                else:
-                    old_score = scores.get(n_item)
-                    new_score = neighbor[1]
-                    # TODO: idf weighting
-                    new_score = new_score * decay
-
-                    if old_score is not None:
-                        new_score = old_score + new_score
-
-                    scores.update({n_item: new_score})
-
-        rank = list()
-        for k, v in scores.items():
-            rank.append((k, v))
+            rows[idx] = self._session_rows[neighbor[0]]
+            # TODO: idf weighting
+            weights[idx] = neighbor[1] * decay
+
+        # Items of all neighbors, each item gets weight of its session
+        segments, positions = csr_rows_positions(rows, self._sequence_indptr)
+        n_items = self._sequence_indices[positions]
+        n_weights = weights[segments]
+
+        if not self.return_events_from_session:
+            item_codes = self._item_codes
+            session_codes = [item_codes[s_item] for s_item in session_items if s_item in item_codes]
+            is_new = ~np.isin(n_items, session_codes)
+            n_items = n_items[is_new]
+            n_weights = n_weights[is_new]
+
+        # Sum scores per item, the order of the first occurrence resolves ties
+        codes, first_idx, inverse = np.unique(n_items, return_index=True, return_inverse=True)
+        scores = np.bincount(inverse.ravel(), weights=n_weights, minlength=len(codes))
+        occurrence_order = np.argsort(first_idx)
+        codes = codes[occurrence_order]
+        scores = scores[occurrence_order]
+
+        ranking = np.argsort(-scores, kind='stable')
+        code_items = self._code_items
+        rank = [(code_items[code], score) for code, score in zip(codes[ranking].tolist(), scores[ranking].tolist())]
         return rank
 
     # Transform, sample, rank - additional
@@ -711,17 +880,29 @@ class WSKNN:
 
         pos_weights = dict()
         length = len(session_items)
+        weighting_fn = get_session_items_scorer(self.weighting_function, length)
 
         for idx, item in enumerate(session_items):
             count = idx + 1
-            pos_weights[item] = weight_session_items(self.weighting_function, count, length)
+            pos_weights[item] = weighting_fn(count)
+
+        if len(pos_weights) == 0 or len(possible_neighbours) == 0:
+            return [[other, 0] for other in possible_neighbours]
+
+        item_codes = self._item_codes
+        known = sorted((item_codes[item], weight) for item, weight in pos_weights.items() if item in item_codes)
+        codes = np.array([x[0] for x in known], dtype=np.int32)
+        weights = np.array([x[1] for x in known], dtype=np.float64)
 
-        items = set(session_items)
-        neighbours = []
-        for other in possible_neighbours:
-            other_items = set(self.session_item_map[other][0])
-            similarity = weight_set_pair(items, other_items, pos_weights)
-            neighbours.append([other, similarity])
+        session_rows = self._session_rows
+        rows = np.fromiter((session_rows[other] for other in possible_neighbours),
+                           dtype=np.int64,
+                           count=len(possible_neighbours))
+
+        similarities = weight_csc_rows(rows, self._item_indptr, self._item_indices, codes, weights)
+        similarities = similarities / len(pos_weights)
+
+        neighbours = [[other, similarity] for other, similarity in zip(possible_neighbours, similarities.tolist())]
 
         return neighbours
 
@@ -763,7 +944,8 @@ class WSKNN:
         : List
           List of n possible sessions with the same items as a customer session.
         """
-        rank = [(ses, len(set(self.session_item_map[ses][0]) & set(session[0]))) for ses in sessions]
+        session_items = set(session[0])
+        rank = [(ses, len(self.session_item_sets[ses] & session_items)) for ses in sessions]
         rank.sort(key=lambda x: x[1])
         result = [x[0] for x in rank]
         sample_size = min(self.possible_neighbors_sample_size, len(sessions))
@@ -851,14 +1033,15 @@ class WSKNN:
           Sessions with the highest weights. Sample of size possible_neighbors_sample_size.
         """
 
-        rank = [(
-            ses,
-            np.mean(
-                self.session_item_map[ses][self.sampling_event_weights_index]
-            )
-        ) for ses in sessions]
+        # Weights index is a public attribute and may be changed after the means were calculated
+        if self._session_weights_mean is None or self._session_weights_mean_index != self.sampling_event_weights_index:
+            self._session_weights_mean = self._mean_session_weights()
+            self._session_weights_mean_index = self.sampling_event_weights_index
+
+        sessions = list(sessions)
+        session_rows = self._session_rows
+        rows = np.fromiter((session_rows[ses] for ses in sessions), dtype=np.int64, count=len(sessions))
+        ranking = np.argsort(-self._session_weights_mean[rows], kind='stable')
 
-        rank.sort(key=lambda x: x[1], reverse=True)
-        result = [x[0] for x in rank]
         sample_size = min(self.possible_neighbors_sample_size, len(sessions))
-        return result[:sample_size]
+        return [sessions[idx] for idx in ranking[:sample_size].tolist()]
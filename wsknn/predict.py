@@ -1,34 +1,45 @@
-from typing import Dict, List
-from wsknn.model.wsknn import WSKNN
+from typing import TYPE_CHECKING, Dict, List, Union
 
+if TYPE_CHECKING:
+    from wsknn.model.wsknn import WSKNN
 
-def predict(model: WSKNN,
-            sessions: List,
-            settings: Dict = None) -> List:
+
+def predict(model: 'WSKNN',
+            sessions: Union[List, Dict],
+            settings: Dict = None) -> Union[List, Dict]:
     """
-    The function is an alias to the .predict() method of the WSKNN model.
+    The function is an alias to the .recommend() and .recommend_batch() methods of the WSKNN model.
 
     Parameters
     ----------
     model : WSKNN
             Fitted VSKNN model.
 
-    sessions : List
+    sessions : List or Dict
                Sequence of items for recommendation. It must be a nested List of lists:
                 [
                     [items],
                     [timestamps],
                     [properties]
                 ]
+               or a Dict of multiple sessions:
+                {
+                    session_id: [
+                        [items],
+                        [timestamps],
+                        [properties]
+                    ]
+                }
 
     settings : Dict
 
     Returns
     -------
-    recommendations : List
+    recommendations : List or Dict
         [
             [item a, rank a], [item b, rank b]
         ]
+        or a Dict of recommendations with the same keys as the input sessions if sessions were passed as a Dict.
 
     Raises
     ------
@@ -38,5 +49,8 @@ def predict(model: WSKNN,
     if model.item_session_map is None or model.session_item_map is None:
         raise ValueError('Given model does not have an item map and a session map. Fit those before prediction')
 
-    recommendations = model.recommend(sessions, settings)
+    if isinstance(sessions, dict):
+        recommendations = model.recommend_batch(sessions, settings)
+    else:
+        recommendations = model.recommend(sessions, settings)
     return recommendations
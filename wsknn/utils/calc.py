@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def weight_set_pair(first: set, second: set, mapped_items_weights: dict) -> float:
     """
     The function calculates weighted average of the common items from two sessions based on the dict with items and
@@ -48,3 +51,74 @@ def is_there_any_common_element(first: set, second: set) -> int:
     """
 
     return int(bool(first & second))
+
+
+def csr_rows_positions(rows: np.ndarray, indptr: np.ndarray):
+    """
+    The function returns positions of elements from the selected rows of a sparse (CSR) matrix.
+
+    Parameters
+    ----------
+    rows : numpy array
+           Indexes of the selected rows.
+
+    indptr : numpy array
+             Row offsets, elements of the row r are stored at positions indptr[r]:indptr[r + 1].
+
+    Returns
+    -------
+    segments, positions : numpy array, numpy array
+        Index of a selected row (0, 1, ... len(rows) - 1) and position of each element, rows are concatenated in
+        the given order.
+    """
+    starts = indptr[rows]
+    lengths = indptr[rows + 1] - starts
+    segments = np.repeat(np.arange(len(rows)), lengths)
+    positions = np.arange(lengths.sum()) + np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+    return segments, positions
+
+
+def weight_csc_rows(rows: np.ndarray,
+                    indptr: np.ndarray,
+                    indices: np.ndarray,
+                    codes: np.ndarray,
+                    weights: np.ndarray) -> np.ndarray:
+    """
+    The function sums weights of the common items between one weighted set and multiple rows of a sparse incidence
+        matrix stored by columns (CSC), only the columns of the weighted set are read.
+
+    Parameters
+    ----------
+    rows : numpy array
+           Indexes of the compared rows.
+
+    indptr : numpy array
+             Column offsets, rows of the column c are stored in indices[indptr[c]:indptr[c + 1]].
+
+    indices : numpy array
+              Row indexes of each column.
+
+    codes : numpy array
+            Unique item codes (columns) of the weighted set.
+
+    weights : numpy array
+              Weights of codes.
+
+    Returns
+    -------
+    numpy array
+        Sum of weights of the common items per row. Always 0 or positive.
+    """
+    if len(codes) == 0 or len(rows) == 0:
+        return np.zeros(len(rows))
+
+    segments, positions = csr_rows_positions(codes, indptr)
+    item_rows = indices[positions]
+
+    unique_rows, inverse = np.unique(rows, return_inverse=True)
+    idx = np.searchsorted(unique_rows, item_rows)
+    idx[idx == len(unique_rows)] = 0
+    hits = unique_rows[idx] == item_rows
+
+    sums = np.bincount(idx[hits], weights=weights[segments[hits]], minlength=len(unique_rows))
+    return sums[inverse.ravel()]
@@ -1,5 +1,11 @@
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    # PyYAML built without libyaml bindings
+    from yaml import SafeLoader
+
 
 def parse_settings(settings_file: str) -> dict:
     """
@@ -17,6 +23,6 @@ def parse_settings(settings_file: str) -> dict:
     """
 
     with open(settings_file, 'r') as fstream:
-        ydict = yaml.safe_load(fstream)
+        ydict = yaml.load(fstream, Loader=SafeLoader)
 
     return ydict
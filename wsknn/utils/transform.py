@@ -1,6 +1,8 @@
+import codecs
 import gzip
 import json
 import pickle
+from itertools import chain
 
 
 def load_pickled(filename: str) -> dict:
@@ -34,11 +36,9 @@ def load_jsonl(filename: str) -> dict:
     : dict
         Python dictionary with unique records.
     """
-    datadict = {}
-    with open(filename, 'r') as fstream:
-        for fline in fstream:
-            pdict = json.loads(fline)
-            datadict.update(pdict)
+    with open(filename, 'rb') as fstream:
+        records = chain.from_iterable(json.loads(fline).items() for fline in fstream)
+        datadict = dict(records)
     return datadict
 
 
@@ -59,11 +59,13 @@ def load_gzipped_jsonl(filename: str, encoding: str = 'UTF-8') -> dict:
         Python dictionary with unique records.
     """
 
-    datadict = {}
+    # json.loads() decodes UTF-8 bytes internally, other encodings must be decoded first
+    is_utf8 = codecs.lookup(encoding).name == 'utf-8'
 
-    with gzip.open(filename, 'rt', encoding=encoding) as fstream:
-        for fline in fstream:
-            datadict.update(json.loads(fline))
+    with gzip.open(filename, 'rb') as fstream:
+        flines = fstream if is_utf8 else (fline.decode(encoding) for fline in fstream)
+        records = chain.from_iterable(json.loads(fline).items() for fline in flines)
+        datadict = dict(records)
 
     return datadict
 
@@ -80,6 +82,7 @@ def load_gzipped_pickle(filename: str) -> dict:
     -------
     pickled_object : dict
     """
+    # Decompress the whole stream at once, pickle.load() on a gzip file makes many small reads through the decoder
     with gzip.open(filename, 'rb') as fstream:
-        pickled_object = pickle.load(fstream)
+        pickled_object = pickle.loads(fstream.read())
     return pickled_object
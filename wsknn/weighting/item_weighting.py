@@ -1,4 +1,8 @@
-from numpy import log10
+from math import log10
+
+
+# Inverse of the largest possible value of 1 / log10(x + 1.7)
+_LOG_NORM = log10(2.7)
 
 
 def linear_item_score(i):
@@ -51,9 +55,7 @@ def log_item_score(i):
     result : float
              Logarithmic rank.
     """
-    norm_term = 1 / (log10(2.7))  # The largest possible value
-    result = 1 / log10(i + 1.7)
-    result = result / norm_term
+    result = _LOG_NORM / log10(i + 1.7)
     return result
 
 
@@ -1,4 +1,8 @@
-from numpy import log10
+from math import log10
+
+
+# Inverse of the largest possible value of 1 / log10(x + 1.7)
+_LOG_NORM = log10(2.7)
 
 
 def linear_session_score(i, length):
@@ -52,10 +56,8 @@ def log_session_score(i, length):
              Session rank between 0 and 1. Normalized from 0:2.31.
     """
 
-    norm_term = 1 / (log10(2.7))  # The largest possible value
-    result = 1 / (log10((length - i) + 1.7))
-
-    return result / norm_term
+    result = _LOG_NORM / log10((length - i) + 1.7)
+    return result
 
 
 def quadratic_session_score(i, length):
@@ -78,4 +80,69 @@ def quadratic_session_score(i, length):
 
     c = i / length
     result = c*c
-    return result
\ No newline at end of file
+    return result
+
+
+# Specialized variants
+
+def make_linear_session_scorer(length):
+    """Function returns linear_session_score() specialized for a sequence of a given length.
+
+    Parameters
+    ----------
+    length : int
+             Length of a sequence.
+
+    Returns
+    -------
+    scorer : Callable
+             Function that takes element position and returns its session rank.
+    """
+
+    def scorer(i):
+        return (i + 1) / length
+
+    return scorer
+
+
+def make_log_session_scorer(length):
+    """Function returns log_session_score() specialized for a sequence of a given length.
+
+    Parameters
+    ----------
+    length : int
+             Length of a sequence.
+
+    Returns
+    -------
+    scorer : Callable
+             Function that takes element position and returns its session rank.
+    """
+
+    base = length + 1.7
+
+    def scorer(i):
+        return _LOG_NORM / log10(base - i)
+
+    return scorer
+
+
+def make_quadratic_session_scorer(length):
+    """Function returns quadratic_session_score() specialized for a sequence of a given length.
+
+    Parameters
+    ----------
+    length : int
+             Length of a sequence.
+
+    Returns
+    -------
+    scorer : Callable
+             Function that takes element position and returns its session rank.
+    """
+
+    def scorer(i):
+        c = i / length
+        return c * c
+
+    return scorer
@@ -0,0 +1,266 @@
+from math import log10
+
+import numpy as np
+
+
+# Inverse of the largest possible value of 1 / log10(x + 1.7)
+_LOG_NORM = log10(2.7)
+
+# Normalization term of the linear function
+_INV_09 = 1.0 / 0.9
+
+
+# Weights are within the [0:1] range, float32 precision is sufficient and it halves memory used by the output arrays.
+
+
+# Sessions
+
+def linear_session_score_vec(i, length, out=None):
+    """Vectorized version of the linear_session_score() function.
+
+    Parameters
+    ----------
+    i : numpy array
+        Elements positions.
+
+    length : int
+             Length of a sequence.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Results
+    -------
+    result : numpy array
+             Session ranks between 0 and 1, float32 if out is not given.
+    """
+
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.add(i, 1, out=out)
+    np.divide(out, length, out=out)
+    return out
+
+
+def log_session_score_vec(i, length, out=None):
+    """Vectorized version of the log_session_score() function. All steps are computed in place within a single
+    output buffer.
+
+    Parameters
+    ----------
+    i : numpy array
+        Elements positions.
+
+    length : int
+             Length of a sequence.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Results
+    -------
+    result : numpy array
+             Session ranks between 0 and 1, float32 if out is not given.
+    """
+
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.subtract(length, i, out=out)
+    np.add(out, 1.7, out=out)
+    np.log10(out, out=out)
+    np.divide(_LOG_NORM, out, out=out)
+    return out
+
+
+def quadratic_session_score_vec(i, length, out=None):
+    """Vectorized version of the quadratic_session_score() function.
+
+    Parameters
+    ----------
+    i : numpy array
+        Elements positions.
+
+    length : int
+             Length of a sequence.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Results
+    -------
+    result : numpy array
+             Session ranks between 0 and 1, float32 if out is not given.
+    """
+
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.divide(i, length, out=out)
+    np.multiply(out, out, out=out)
+    return out
+
+
+# Items
+
+def linear_item_score_vec(i, out=None):
+    """Vectorized version of the linear_item_score() function.
+
+    Parameters
+    ----------
+    i : numpy array
+        Items positions.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Returns
+    -------
+    result : numpy array
+             Linear ranks, float32 if out is not given.
+    """
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.multiply(i, -0.1, out=out)
+    np.add(out, 1.0, out=out)
+    np.maximum(out, 0.0, out=out)
+    np.multiply(out, _INV_09, out=out)
+    return out
+
+
+def inv_pos_item_score_vec(i, out=None):
+    """Vectorized version of the inv_pos_item_score() function.
+
+    Parameters
+    ----------
+    i : numpy array
+        Items positions.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Returns
+    -------
+    result : numpy array
+             Inverted position ranks, float32 if out is not given.
+    """
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.divide(1.0, i, out=out)
+    return out
+
+
+def log_item_score_vec(i, out=None):
+    """Vectorized version of the log_item_score() function.
+
+    Parameters
+    ----------
+    i : numpy array
+        Items positions.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Returns
+    -------
+    result : numpy array
+             Logarithmic ranks, float32 if out is not given.
+    """
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.add(i, 1.7, out=out)
+    np.log10(out, out=out)
+    np.divide(_LOG_NORM, out, out=out)
+    return out
+
+
+def quadratic_item_score_vec(i, out=None):
+    """Vectorized version of the quadratic_item_score() function.
+
+    Parameters
+    ----------
+    i : numpy array
+        Items positions.
+
+    out : numpy array, optional
+          Floating point array of the same shape as i, results are written into it.
+
+    Returns
+    -------
+    result : numpy array
+             Inverted square position ranks, float32 if out is not given.
+    """
+    if out is None:
+        out = np.empty(np.shape(i), dtype=np.float32)
+
+    np.multiply(i, i, out=out)
+    np.divide(1.0, out, out=out)
+    return out
+
+
+# Dispatch
+
+ITEM_WEIGHTING_FUNCTIONS_VEC = {
+    'linear': linear_item_score_vec,
+    'inv': inv_pos_item_score_vec,
+    'log': log_item_score_vec,
+    'quadratic': quadratic_item_score_vec
+}
+
+SESSION_WEIGHTING_FUNCTIONS_VEC = {
+    'linear': linear_session_score_vec,
+    'log': log_session_score_vec,
+    'quadratic': quadratic_session_score_vec
+}
+
+
+def weight_item_score_vec(fn_name: str, element_pos: np.ndarray) -> np.ndarray:
+    """Function calculates weights of multiple items based on their positions in a session.
+
+    Parameters
+    ----------
+    fn_name : str
+              Function used for item weighting. Available options: 'linear', 'div', 'log', 'quadratic'.
+
+    element_pos : numpy array
+                  Positions of elements in a sequence.
+
+    Returns
+    -------
+    numpy array
+        Items weights.
+    """
+
+    weighting_fn = ITEM_WEIGHTING_FUNCTIONS_VEC.get(fn_name)
+
+    if weighting_fn is not None:
+        return weighting_fn(element_pos)
+    else:
+        return np.ones(np.shape(element_pos), dtype=np.float32)
+
+
+def weight_session_items_vec(fn_name: str, element_pos: np.ndarray, length: int) -> np.ndarray:
+    """Function weights multiple session items by specific fn.
+
+    Parameters
+    ----------
+    fn_name : str
+              Function used for session weighting. Available options: 'linear', 'log', 'quadratic'.
+
+    element_pos : numpy array
+                  Positions of elements in a sequence.
+
+    length : int
+             Overall session length.
+
+    Returns
+    -------
+    numpy array
+        Session's items weights.
+    """
+
+    return SESSION_WEIGHTING_FUNCTIONS_VEC[fn_name](element_pos, length)
@@ -1,5 +1,29 @@
+from typing import Callable
+
 from wsknn.weighting.item_weighting import inv_pos_item_score, linear_item_score, log_item_score, quadratic_item_score
 from wsknn.weighting.session_weighting import linear_session_score, log_session_score, quadratic_session_score
+from wsknn.weighting.session_weighting import make_linear_session_scorer, make_log_session_scorer,\
+    make_quadratic_session_scorer
+
+
+ITEM_WEIGHTING_FUNCTIONS = {
+    'linear': linear_item_score,
+    'inv': inv_pos_item_score,
+    'log': log_item_score,
+    'quadratic': quadratic_item_score
+}
+
+SESSION_WEIGHTING_FUNCTIONS = {
+    'linear': linear_session_score,
+    'log': log_session_score,
+    'quadratic': quadratic_session_score
+}
+
+SESSION_WEIGHTING_SCORERS = {
+    'linear': make_linear_session_scorer,
+    'log': make_log_session_scorer,
+    'quadratic': make_quadratic_session_scorer
+}
 
 
 # Items
@@ -21,15 +45,10 @@ def weight_item_score(fn_name: str, element_pos: int) -> float:
         Item weight.
     """
 
-    weighting = {
-        'linear': linear_item_score,
-        'inv': inv_pos_item_score,
-        'log': log_item_score,
-        'quadratic': quadratic_item_score
-    }
+    weighting_fn = ITEM_WEIGHTING_FUNCTIONS.get(fn_name)
 
-    if fn_name in weighting:
-        return weighting[fn_name](element_pos)
+    if weighting_fn is not None:
+        return weighting_fn(element_pos)
     else:
         return 1
 
@@ -56,10 +75,26 @@ def weight_session_items(fn_name: str, element_pos: int, length: int) -> float:
         Session's item weight.
     """
 
-    weighting = {
-        'linear': linear_session_score,
-        'log': log_session_score,
-        'quadratic': quadratic_session_score
-    }
+    return SESSION_WEIGHTING_FUNCTIONS[fn_name](element_pos, length)
+
+
+def get_session_items_scorer(fn_name: str, length: int) -> Callable:
+    """Function returns session weighting fn specialized for a session of a given length. Use it if all items from
+    the same session are weighted.
+
+    Parameters
+    ----------
+    fn_name : str
+              Function used for session weighting. Available options: 'linear', 'log', 'quadratic'.
+
+    length : int
+             Overall session length.
+
+    Returns
+    -------
+    Callable
+        Function that takes position of an element in a sequence and returns session's item weight.
+    """
+
+    return SESSION_WEIGHTING_SCORERS[fn_name](length)
 
-    return weighting[fn_name](element_pos, length)